@@ -11,10 +11,10 @@ import datetime
 import logging
 import sys
 from pathlib import Path
+from typing import List
 
 from src.config import ProcessorConfig
-from src.document_processor import DocumentProcessor
-from src.gui_utils import select_folder, select_file
+from src.pdf_operations import PDF_BACKENDS, DEFAULT_PDF_BACKEND
 
 
 # Set up logging
@@ -35,6 +35,17 @@ def parse_date(date_str: str) -> datetime.date:
         return datetime.date.today()
 
 
+def worker_count(value: str) -> int:
+    """Parse the --workers option, which must not be negative."""
+    try:
+        workers = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if workers < 0:
+        raise argparse.ArgumentTypeError("must be 0 or greater")
+    return workers
+
+
 def get_user_input_date() -> datetime.date:
     """Prompt user for a date with today as default."""
     today_str = datetime.date.today().strftime("%Y-%m-%d")
@@ -47,6 +58,9 @@ def get_user_input_date() -> datetime.date:
 
 def interactive_setup() -> ProcessorConfig:
     """Set up configuration interactively using GUI dialogs."""
+    # Imported here so batch mode and --help never load tkinter
+    from src.gui_utils import select_folder, select_file
+    
     logger.info("Starting interactive configuration")
     print("--- PDF Document Processor Configuration ---")
     
@@ -97,11 +111,68 @@ def interactive_setup() -> ProcessorConfig:
     return config
 
 
+def read_file_list(lines) -> List[Path]:
+    """Read newline-separated file paths, ignoring blank lines."""
+    return [Path(line.strip()) for line in lines if line.strip()]
+
+
 def batch_setup(args) -> ProcessorConfig:
-    """Set up configuration from command line arguments."""
-    # This is a placeholder for future batch mode implementation
-    logger.error("Batch mode not implemented yet")
-    raise NotImplementedError("Batch mode not yet implemented")
+    """Set up configuration from command line arguments.
+    
+    The source documents come from --source, which is either a folder to
+    scan or "-" to read file paths from stdin, or from a --file-list text
+    file with one path per line.
+    """
+    logger.info("Starting batch configuration")
+    
+    if not args.output:
+        logger.error("No output folder given")
+        print("Error: --output is required in batch mode. Exiting.")
+        sys.exit(1)
+    
+    start_date = datetime.date.today()
+    if args.date:
+        try:
+            start_date = datetime.datetime.strptime(args.date, "%Y-%m-%d").date()
+        except ValueError:
+            logger.error(f"Invalid date format: {args.date}")
+            print(f"Error: --date must be in YYYY-MM-DD format, got '{args.date}'. Exiting.")
+            sys.exit(1)
+    
+    source_files = None
+    if args.file_list:
+        try:
+            with open(args.file_list, "r", encoding="utf-8") as f:
+                source_files = read_file_list(f)
+        except OSError as e:
+            logger.error(f"Failed to read file list: {e}")
+            print(f"Error: Could not read file list {args.file_list}: {e}. Exiting.")
+            sys.exit(1)
+        source_folder = Path(args.source) if args.source and args.source != "-" else Path.cwd()
+    elif args.source == "-":
+        source_files = read_file_list(sys.stdin)
+        source_folder = Path.cwd()
+    elif args.source:
+        source_folder = Path(args.source)
+    else:
+        logger.error("No source given")
+        print("Error: --source or --file-list is required in batch mode. Exiting.")
+        sys.exit(1)
+    
+    config = ProcessorConfig(
+        source_folder=source_folder,
+        supplementary_folder=Path(args.supplementary) if args.supplementary else None,
+        appendix_file=Path(args.appendix) if args.appendix else None,
+        output_folder=Path(args.output),
+        start_date=start_date,
+        source_files=source_files
+    )
+    
+    if source_files is not None:
+        logger.info(f"Batch configuration with {len(source_files)} listed files")
+    else:
+        logger.info(f"Batch configuration for folder {config.source_folder}")
+    return config
 
 
 def main():
@@ -113,7 +184,12 @@ def main():
     )
     parser.add_argument(
         "--source", type=str,
-        help="Source folder containing PDF files (for batch mode)"
+        help="Source folder containing PDF files, or - to read file paths "
+             "from stdin (for batch mode)"
+    )
+    parser.add_argument(
+        "--file-list", type=str,
+        help="Text file listing source PDF paths, one per line (for batch mode)"
     )
     parser.add_argument(
         "--output", type=str,
@@ -131,6 +207,18 @@ def main():
         "--date", type=str,
         help="Start date in YYYY-MM-DD format (for batch mode)"
     )
+    parser.add_argument(
+        "--workers", type=worker_count, default=1,
+        help="Number of worker processes used for merging (0 = one per CPU core)"
+    )
+    parser.add_argument(
+        "--backend", choices=sorted(PDF_BACKENDS), default=DEFAULT_PDF_BACKEND,
+        help="PDF library used for merging (falls back to pypdf if not installed)"
+    )
+    parser.add_argument(
+        "--compress", action="store_true",
+        help="Compress merged files (smaller output, slower merging)"
+    )
     parser.add_argument(
         "--verbose", "-v", action="store_true",
         help="Enable verbose output"
@@ -145,18 +233,20 @@ def main():
     
     try:
         if args.batch:
-            # Implement batch mode configuration here
             logger.info("Starting in batch mode")
-            try:
-                config = batch_setup(args)
-            except NotImplementedError as e:
-                print(f"Error: {e}")
-                sys.exit(1)
+            config = batch_setup(args)
         else:
             # Interactive mode
             logger.info("Starting in interactive mode")
             config = interactive_setup()
         
+        config.workers = args.workers
+        config.pdf_backend = args.backend
+        config.compress = args.compress
+        
+        # Imported here so argument errors and --help never load the PDF code
+        from src.document_processor import DocumentProcessor
+        
         # Process documents
         logger.info("Beginning document processing")
         processor = DocumentProcessor(config)
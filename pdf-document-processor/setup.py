@@ -17,5 +17,9 @@ setup(
     install_requires=[
         'pypdf>=3.0.0',
     ],
+    extras_require={
+        'pdfium': ['pypdfium2>=4.0.0'],
+        'pymupdf': ['PyMuPDF>=1.24.3'],
+    },
     python_requires=">=3.7",
 )
\ No newline at end of file
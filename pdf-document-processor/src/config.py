@@ -3,9 +3,13 @@
 import dataclasses
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable
 import datetime
 import json
+import re
+
+from .file_utils import compile_id_matcher
+from .pdf_operations import PDF_BACKENDS, DEFAULT_PDF_BACKEND
 
 logger = logging.getLogger(__name__)
 
@@ -20,9 +24,15 @@ class ProcessorConfig:
     file_pattern: str = "*.pdf"
     id_pattern: str = r"^[A-Za-z]\d+$"
     recursive: bool = False
+    workers: int = 1
+    pdf_backend: str = DEFAULT_PDF_BACKEND
+    # Trade merge time for smaller output files
+    compress: bool = False
+    # Explicit list of source files; when set, source_folder is not scanned
+    source_files: Optional[List[Path]] = None
 
     def __post_init__(self):
-        """Convert string paths to Path objects if needed."""
+        """Convert string paths to Path objects and compile the ID pattern."""
         if isinstance(self.source_folder, str):
             self.source_folder = Path(self.source_folder)
         if isinstance(self.supplementary_folder, str) and self.supplementary_folder:
@@ -31,12 +41,40 @@ class ProcessorConfig:
             self.appendix_file = Path(self.appendix_file)
         if isinstance(self.output_folder, str):
             self.output_folder = Path(self.output_folder)
+        if self.source_files is not None:
+            self.source_files = [Path(p) for p in self.source_files]
         if isinstance(self.start_date, str):
             self.start_date = datetime.datetime.strptime(self.start_date, "%Y-%m-%d").date()
+        # Not dataclass fields, so to_dict() still stores the pattern string.
+        # An invalid pattern is reported by validate() rather than raised here.
+        self._id_pattern_error: Optional[re.error] = None
+        try:
+            self._match_id: Optional[Callable[[str], Optional[str]]] = compile_id_matcher(self.id_pattern)
+        except re.error as e:
+            self._id_pattern_error = e
+            self._match_id = None
+
+    def match_id(self, filename: str) -> Optional[str]:
+        """Extract the document ID from a filename using id_pattern.
+        
+        Args:
+            filename: Filename to extract ID from
+            
+        Returns:
+            Extracted ID or None if the filename has no valid ID (always
+            None if id_pattern is not a valid regex)
+        """
+        if self._match_id is None:
+            return None
+        return self._match_id(filename)
 
     def validate(self) -> bool:
         """Validate the configuration."""
         try:
+            if self._id_pattern_error is not None:
+                logger.error(f"Invalid ID pattern {self.id_pattern!r}: {self._id_pattern_error}")
+                return False
+                
             if not self.source_folder.exists():
                 logger.error(f"Source folder does not exist: {self.source_folder}")
                 return False
@@ -49,6 +87,10 @@ class ProcessorConfig:
                 logger.error(f"Appendix file does not exist: {self.appendix_file}")
                 return False
                 
+            if self.workers < 0:
+                logger.error(f"Number of workers must be 0 or greater: {self.workers}")
+                return False
+                
             if not self.output_folder.exists():
                 logger.info(f"Creating output folder: {self.output_folder}")
                 try:
@@ -57,6 +99,10 @@ class ProcessorConfig:
                     logger.error(f"Failed to create output folder: {e}")
                     return False
                     
+            if self.pdf_backend not in PDF_BACKENDS:
+                logger.error(f"Unknown PDF backend: {self.pdf_backend}")
+                return False
+                
             return True
         except Exception as e:
             logger.error(f"Error validating configuration: {e}")
@@ -72,7 +118,14 @@ class ProcessorConfig:
             "start_date": self.start_date.isoformat(),
             "file_pattern": self.file_pattern,
             "id_pattern": self.id_pattern,
-            "recursive": self.recursive
+            "recursive": self.recursive,
+            "workers": self.workers,
+            "pdf_backend": self.pdf_backend,
+            "compress": self.compress,
+            "source_files": (
+                [str(p) for p in self.source_files]
+                if self.source_files is not None else None
+            )
         }
         
     @classmethod
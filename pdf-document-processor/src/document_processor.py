@@ -1,38 +1,263 @@
 """Core document processing logic."""
 
+import array
 import datetime
 import logging
 import os
+import queue
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from .config import ProcessorConfig
-from .file_utils import get_file_date, extract_id_from_filename, find_matching_files
-from .pdf_operations import merge_pdf_files
+from .file_utils import FolderIndex, date_from_timestamp, iter_listed_entries, iter_pdf_entries
+from .pdf_operations import merge_pdf_files, close_shared_documents
 
 logger = logging.getLogger(__name__)
 
+# Indices into the statistics counters, in the order of STAT_KEYS
+S_PROCESSED = 0
+S_SKIPPED_FORMAT = 1
+S_SKIPPED_DATE = 2
+S_ERRORS = 3
+STAT_KEYS = ("processed", "skipped_format", "skipped_date", "errors")
+
+# Number of documents whose progress messages are written in one go
+LOG_FLUSH_INTERVAL = 100
+
+# Number of documents submitted ahead of the results, per worker process
+MAX_PENDING_PER_WORKER = 4
+
+# Number of documents the scan may find ahead of merging in serial mode
+MAX_PREFETCH_TASKS = 64
+
+# Arguments of _merge_one after the config:
+# (source_path, doc_id, file_date, supp_path, supp_multiple, overwrite)
+Task = Tuple[Path, str, Optional[datetime.date], Optional[Path], bool, bool]
+
+
+def _new_counters() -> array.array:
+    """Return a zeroed array of statistics counters."""
+    return array.array("Q", [0] * len(STAT_KEYS))
+
+
+_END_OF_TASKS = object()
+
+
+def _prefetch_tasks(tasks: Iterable[Task], max_ahead: int) -> Iterator[Task]:
+    """Iterate over tasks produced by a background thread.
+
+    The thread keeps up to max_ahead tasks ready, so producing the next
+    tasks (a directory walk) overlaps with the caller's work on the current
+    one. An exception raised while producing is re-raised to the caller.
+    """
+    ready: "queue.Queue[Tuple[Any, Optional[BaseException]]]" = queue.Queue(max_ahead)
+    stop = threading.Event()
+
+    def put(item: Any, error: Optional[BaseException] = None) -> bool:
+        # Time out now and then so an abandoned iteration stops the thread
+        while not stop.is_set():
+            try:
+                ready.put((item, error), timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for task in tasks:
+                if not put(task):
+                    return
+        except BaseException as e:
+            put(_END_OF_TASKS, e)
+        else:
+            put(_END_OF_TASKS)
+
+    thread = threading.Thread(target=produce, name="document-scan", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = ready.get()
+            if item is _END_OF_TASKS:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _merge_one(
+    config_dict: Dict[str, Any],
+    source_path: Path,
+    doc_id: str,
+    file_date: Optional[datetime.date],
+    supp_path: Optional[Path] = None,
+    supp_multiple: bool = False,
+    overwrite: bool = False,
+    appendix_entry: Optional[Dict[str, Any]] = None
+) -> Tuple[array.array, List[str]]:
+    """Process a single document file.
+
+    This runs inside worker processes, so it only takes picklable
+    arguments and reports back through the returned counters. Progress
+    messages are collected rather than printed so the parent process can
+    write them in batches without interleaving output from workers.
+
+    Args:
+        config_dict: Serialized configuration (see ProcessorConfig.to_dict)
+        source_path: Path to the source document
+        doc_id: Extracted document ID
+        file_date: Document modification date or None
+        supp_path: First supplementary file (by name) for doc_id, if any
+        supp_multiple: Whether other supplementary files also matched doc_id
+        overwrite: Whether the output file already exists
+        appendix_entry: Prebuilt merge entry for the appendix, if any
+
+    Returns:
+        Tuple of (statistics counters indexed by the S_* constants,
+        list of progress messages)
+    """
+    # The config was validated by the parent, so its values are trusted
+    # here without rebuilding a ProcessorConfig for every document
+    output_folder = Path(config_dict["output_folder"])
+    have_supp = config_dict["supplementary_folder"] is not None
+    stats = _new_counters()
+    lines: List[str] = []
+
+    date_str = file_date.strftime('%Y-%m-%d') if file_date else "Unknown Date"
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Processing document: %s (ID: %s, Date: %s)", source_path.name, doc_id, date_str)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        lines.append("-" * 40)
+    lines.append(f"Processing: {source_path.name} (Date: {date_str})")
+    lines.append(f"  Extracted ID: {doc_id}")
+
+    # Report the supplementary document if configured
+    if have_supp:
+        if supp_path:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Found supplementary file: %s", supp_path.name)
+            lines.append(f"  Found supplementary file: {supp_path.name}")
+            if supp_multiple:
+                logger.warning("Multiple matches found for ID %s. Using '%s'", doc_id, supp_path.name)
+                lines.append(f"  Note: Multiple matches found. Using '{supp_path.name}'")
+        else:
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("No supplementary file found for ID %s", doc_id)
+
+    # Define output path
+    output_path = output_folder / source_path.name
+
+    # Warn if output file already exists
+    if overwrite:
+        logger.warning("Output file already exists: %s", output_path)
+        lines.append(f"  Warning: Output file already exists. It will be overwritten.")
+
+    # Prepare files to merge
+    files_to_merge = [
+        {"path": source_path, "description": f"Main document: {source_path.name}"}
+    ]
+
+    # Add supplementary document if found (the index only holds files)
+    if supp_path:
+        try:
+            # Add all pages except the last one
+            files_to_merge.append({
+                "path": supp_path,
+                "pages": (0, -2),  # All pages except the last
+                "description": f"Supplementary data: {supp_path.name} (excluding last page)"
+            })
+        except Exception as e:
+            logger.error("Error preparing supplementary file: %s", e)
+            lines.append(f"  Error preparing supplementary file: {e}")
+            stats[S_ERRORS] += 1
+
+    # Add appendix if configured
+    if appendix_entry:
+        files_to_merge.append(appendix_entry)
+
+    # Perform the merge
+    success = merge_pdf_files(
+        files_to_merge, output_path, config_dict["pdf_backend"], lines, config_dict["compress"]
+    )
+
+    if success:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Successfully processed %s", source_path.name)
+        lines.append(f"  Successfully merged and saved to {output_path}")
+        stats[S_PROCESSED] += 1
+    else:
+        logger.error("Failed to process %s", source_path.name)
+        lines.append(f"  Failed to process {source_path.name}")
+        stats[S_ERRORS] += 1
+
+    return stats, lines
+
+
 class DocumentProcessor:
     """Processor for merging and organizing document files."""
-    
+
     def __init__(self, config: ProcessorConfig):
         """Initialize with configuration.
-        
+
         Args:
             config: ProcessorConfig object with processing parameters
         """
         self.config = config
-        self.stats = {
-            "processed": 0,
-            "skipped_format": 0,
-            "skipped_date": 0,
-            "errors": 0
-        }
+        self._stats = _new_counters()
+        # Counted by the scan, which may run in another thread than merging
+        self._scan_stats = _new_counters()
+        self._supp_index: Optional[FolderIndex] = None
+        self._existing_outputs: Set[str] = set()
+
+        # The appendix is the same for every document, so its merge entry
+        # is built once; merge_pdf_files only reads it
+        appendix = config.appendix_file
+        if appendix and appendix.is_file():
+            self._appendix_entry: Optional[Dict[str, Any]] = {
+                "path": appendix,
+                "description": f"Appendix: {appendix.name}",
+                "shared": True
+            }
+        else:
+            self._appendix_entry = None
+        self._log_buf: List[str] = []
+        self._log_buf_docs = 0
+        self._scanned = 0
+        self._match_id = config.match_id
+        # Files modified before this POSIX timestamp are skipped
+        self._start_ts = datetime.datetime.combine(
+            config.start_date, datetime.time.min
+        ).timestamp()
         logger.info("Document processor initialized")
-    
-    def process_documents(self) -> Dict[str, int]:
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Processing statistics keyed by counter name."""
+        return dict(zip(STAT_KEYS, self._stats))
+
+    def process_documents(
+        self,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Dict[str, int]:
         """Process all documents according to configuration.
-        
+
+        The source folder is scanned lazily: documents are handed to the
+        workers as soon as they are found, so merging overlaps with the
+        rest of the scan.
+
+        Args:
+            progress_callback: Optional callable invoked as
+                progress_callback(completed, queued) after each document,
+                where queued is the number of documents found so far
+
         Returns:
             Dictionary with processing statistics
         """
@@ -40,130 +265,284 @@ class DocumentProcessor:
             logger.error("Invalid configuration")
             print("Error: Invalid configuration")
             return self.stats
-            
-        logger.info(f"Scanning for documents in {self.config.source_folder}")
-        print("\nScanning for documents...")
-        
-        # Use recursive glob if configured
-        if self.config.recursive:
-            glob_pattern = f"**/{self.config.file_pattern}"
+
+        # Invariants checked by validate() are not re-checked per document
+        self._build_supp_index()
+        self._existing_outputs = set(os.listdir(self.config.output_folder))
+
+        if self.config.source_files is not None:
+            logger.info("Processing %d listed documents", len(self.config.source_files))
         else:
-            glob_pattern = self.config.file_pattern
-            
-        source_files = list(self.config.source_folder.glob(glob_pattern))
-        
-        if not source_files:
-            logger.warning(f"No matching files found in {self.config.source_folder}")
+            logger.info("Scanning for documents in %s", self.config.source_folder)
+        print("\nScanning for documents and processing...")
+
+        self._scanned = 0
+        self._scan_stats = _new_counters()
+        try:
+            self._run_tasks(self._iter_tasks(), progress_callback)
+        finally:
+            for index, value in enumerate(self._scan_stats):
+                self._stats[index] += value
+            self._flush_log()
+            close_shared_documents()
+
+        if not self._scanned:
+            logger.warning("No matching files found in %s", self.config.source_folder)
             print(f"No matching files found in {self.config.source_folder}")
             return self.stats
-            
-        logger.info(f"Found {len(source_files)} potential documents")
-        print(f"Found {len(source_files)} potential documents. Processing...")
-        
-        for source_path in source_files:
-            if not source_path.is_file():
-                logger.debug(f"Skipping non-file: {source_path}")
-                continue
-                
-            # Check file date
-            file_date = get_file_date(source_path)
-            if file_date and file_date < self.config.start_date:
-                logger.debug(f"Skipping {source_path.name} - before start date")
-                self.stats["skipped_date"] += 1
+
+        logger.info("Found %d potential documents", self._scanned)
+        logger.info("Processing complete. Stats: %s", self.stats)
+        return self.stats
+
+    def _iter_tasks(self) -> Iterator[Task]:
+        """Scan the source folder and yield the documents to merge.
+
+        Yields:
+            Task tuples to pass to _merge_one
+        """
+        if self.config.source_files is not None:
+            entries = iter_listed_entries(
+                self.config.source_files,
+                self.config.file_pattern,
+                on_error=self._listed_file_error
+            )
+        else:
+            # The walk overlaps with merging, so it must not pick up the
+            # outputs if they are written below the source folder
+            entries = iter_pdf_entries(
+                self.config.source_folder,
+                self.config.file_pattern,
+                self.config.recursive,
+                exclude_dirs=[self.config.output_folder]
+            )
+
+        for entry in entries:
+            self._scanned += 1
+
+            # Check file date against the raw timestamp
+            try:
+                mtime = entry.stat().st_mtime
+            except OSError as e:
+                logger.warning("Could not get date for %s: %s", entry.name, e)
+                mtime = None
+            if mtime is not None and mtime < self._start_ts:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Skipping %s - before start date", entry.name)
+                self._scan_stats[S_SKIPPED_DATE] += 1
                 continue
-                
+
             # Extract ID from filename
-            doc_id = extract_id_from_filename(source_path.name, self.config.id_pattern)
+            doc_id = self._match_id(entry.name)
             if not doc_id:
-                logger.debug(f"Skipping {source_path.name} - no valid ID found")
-                self.stats["skipped_format"] += 1
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Skipping %s - no valid ID found", entry.name)
+                self._scan_stats[S_SKIPPED_FORMAT] += 1
                 continue
-                
-            # Process this document
-            self._process_single_document(source_path, doc_id, file_date)
-            
-        logger.info(f"Processing complete. Stats: {self.stats}")
-        return self.stats
-    
-    def _process_single_document(
-        self, 
-        source_path: Path, 
-        doc_id: str, 
-        file_date: Optional[datetime.date]
+
+            source_path = Path(entry.path)
+            file_date = date_from_timestamp(mtime) if mtime is not None else None
+            supp_matches = self._supp_index.get(doc_id) if self._supp_index is not None else []
+            supp_path = supp_matches[0] if supp_matches else None
+            supp_multiple = len(supp_matches) > 1
+
+            # Outputs are named after their source, so a repeated name in a
+            # recursive scan overwrites an output written earlier in this run
+            overwrite = entry.name in self._existing_outputs
+            self._existing_outputs.add(entry.name)
+
+            yield source_path, doc_id, file_date, supp_path, supp_multiple, overwrite
+
+    def _listed_file_error(self, path: str, reason: str) -> None:
+        """Count a listed file that cannot be processed as an error."""
+        self._scanned += 1
+        self._scan_stats[S_ERRORS] += 1
+        logger.error("Cannot process listed file %s: %s", path, reason)
+        print(f"Error: Cannot process listed file {path}: {reason}")
+
+    def _build_supp_index(self) -> None:
+        """Index the supplementary folder by the leading ID of each filename.
+
+        The folder is listed once per run instead of once per document,
+        and only files are indexed, so documents can use a match without
+        checking it again. If the folder cannot be read, documents are
+        merged without supplementary files.
+        """
+        self._supp_index = None
+        folder = self.config.supplementary_folder
+        if not folder:
+            return
+
+        try:
+            self._supp_index = FolderIndex(folder, ".pdf", id_re=None)
+        except OSError as e:
+            logger.error("Error reading supplementary folder %s: %s", folder, e)
+            print(f"Error reading supplementary folder {folder}: {e}")
+            return
+        logger.info("Indexed %d supplementary IDs", len(self._supp_index))
+
+    def _run_tasks(
+        self,
+        tasks: Iterable[Task],
+        progress_callback: Optional[Callable[[int, int], None]] = None
     ) -> None:
-        """Process a single document file.
-        
+        """Merge the filtered documents, in parallel if configured.
+
+        Tasks are consumed lazily. In serial mode they are produced by a
+        background thread up to MAX_PREFETCH_TASKS ahead, so the scan goes
+        on while a document is merged. In parallel mode at most
+        MAX_PENDING_PER_WORKER tasks per worker are submitted ahead of the
+        results, so a large folder does not queue up all of its documents
+        in memory while the scan keeps feeding the pool. If a worker process
+        dies, the pool is replaced and only the document that crashed it is
+        counted as an error.
+
         Args:
-            source_path: Path to the source document
-            doc_id: Extracted document ID
-            file_date: Document modification date or None
+            tasks: Iterable of Task tuples to pass to _merge_one
+            progress_callback: Optional callable invoked as
+                progress_callback(completed, queued) after each document
         """
-        date_str = file_date.strftime('%Y-%m-%d') if file_date else "Unknown Date"
-        logger.info(f"Processing document: {source_path.name} (ID: {doc_id}, Date: {date_str})")
-        
-        print("-" * 40)
-        print(f"Processing: {source_path.name} (Date: {date_str})")
-        print(f"  Extracted ID: {doc_id}")
-        
-        # Find supplementary document if configured
-        supp_path = None
-        if self.config.supplementary_folder:
-            matching_files = find_matching_files(
-                self.config.supplementary_folder, 
-                doc_id
+        config_dict = self.config.to_dict()
+        # Workers never need the source list, so don't ship it with every task
+        config_dict["source_files"] = None
+        workers = self.config.workers or os.cpu_count() or 1
+        queued = completed = 0
+
+        if workers == 1:
+            for task in _prefetch_tasks(tasks, MAX_PREFETCH_TASKS):
+                queued += 1
+                try:
+                    result = _merge_one(config_dict, *task, appendix_entry=self._appendix_entry)
+                except Exception as e:
+                    result = self._task_failed(task[0], e)
+                self._merge_stats(result)
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, queued)
+            return
+
+        logger.info("Merging documents with %d worker processes", workers)
+        pending: Dict[Future, Task] = {}
+
+        def submit(executor: ProcessPoolExecutor, task: Task) -> Future:
+            return executor.submit(
+                _merge_one, config_dict, *task, appendix_entry=self._appendix_entry
             )
-            if matching_files:
-                supp_path = matching_files[0]
-                logger.info(f"Found supplementary file: {supp_path.name}")
-                print(f"  Found supplementary file: {supp_path.name}")
-                if len(matching_files) > 1:
-                    logger.warning(f"Multiple matches found for ID {doc_id}. Using '{supp_path.name}'")
-                    print(f"  Note: Multiple matches found. Using '{supp_path.name}'")
-            else:
-                logger.info(f"No supplementary file found for ID {doc_id}")
-        
-        # Define output path
-        output_path = self.config.output_folder / source_path.name
-        
-        # Check if output file already exists
-        if output_path.exists():
-            logger.warning(f"Output file already exists: {output_path}")
-            print(f"  Warning: Output file already exists. It will be overwritten.")
-        
-        # Prepare files to merge
-        files_to_merge = [
-            {"path": source_path, "description": f"Main document: {source_path.name}"}
-        ]
-        
-        # Add supplementary document if found
-        if supp_path and supp_path.is_file():
+
+        def add_result(result: Tuple[array.array, List[str]]) -> None:
+            nonlocal completed
+            self._merge_stats(result)
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, queued)
+
+        def record(task: Task, future: Future) -> bool:
+            """Add a finished task's result; False if its worker pool broke first."""
             try:
-                # Add all pages except the last one
-                files_to_merge.append({
-                    "path": supp_path,
-                    "pages": (0, -2),  # All pages except the last
-                    "description": f"Supplementary data: {supp_path.name} (excluding last page)"
-                })
+                result = future.result()
+            except BrokenProcessPool:
+                return False
             except Exception as e:
-                logger.error(f"Error preparing supplementary file: {e}")
-                print(f"  Error preparing supplementary file: {e}")
-                self.stats["errors"] += 1
-        
-        # Add appendix if configured
-        if self.config.appendix_file and self.config.appendix_file.is_file():
-            files_to_merge.append({
-                "path": self.config.appendix_file,
-                "description": f"Appendix: {self.config.appendix_file.name}"
-            })
-        
-        # Perform the merge
-        success = merge_pdf_files(files_to_merge, output_path)
-        
-        if success:
-            logger.info(f"Successfully processed {source_path.name}")
-            print(f"  Successfully merged and saved to {output_path}")
-            self.stats["processed"] += 1
-        else:
-            logger.error(f"Failed to process {source_path.name}")
-            print(f"  Failed to process {source_path.name}")
-            self.stats["errors"] += 1
+                result = self._task_failed(task[0], e)
+            add_result(result)
+            return True
+
+        def collect(done: Iterable[Future]) -> List[Task]:
+            """Record finished tasks and return those lost to a broken pool."""
+            lost = []
+            for future in done:
+                task = pending.pop(future)
+                if not record(task, future):
+                    lost.append(task)
+            return lost
+
+        def recover(executor: ProcessPoolExecutor, lost: List[Task]) -> ProcessPoolExecutor:
+            """Rerun the tasks of a broken pool and return a fresh pool.
+
+            A worker that dies (e.g. a native crash in a PDF library) breaks
+            the whole pool and fails every pending task with it, so these
+            are rerun one at a time in a separate process; only a task whose
+            process dies again is counted as an error.
+            """
+            # The other pending tasks failed with the pool as well
+            lost.extend(collect(as_completed(list(pending))))
+            executor.shutdown()
+            logger.warning(
+                "A worker process died; retrying %d documents one at a time", len(lost)
+            )
+            isolated: Optional[ProcessPoolExecutor] = None
+            for task in lost:
+                if isolated is None:
+                    isolated = ProcessPoolExecutor(max_workers=1)
+                if not record(task, submit(isolated, task)):
+                    add_result(self._task_failed(
+                        task[0], RuntimeError("worker process terminated abruptly")
+                    ))
+                    isolated.shutdown()
+                    isolated = None
+            if isolated is not None:
+                isolated.shutdown()
+            return ProcessPoolExecutor(max_workers=workers)
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            for task in tasks:
+                queued += 1
+                try:
+                    future = submit(executor, task)
+                except BrokenProcessPool:
+                    executor = recover(executor, [task])
+                    continue
+                pending[future] = task
+                if len(pending) >= workers * MAX_PENDING_PER_WORKER:
+                    lost = collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                    if lost:
+                        executor = recover(executor, lost)
+
+            while pending:
+                lost = collect(as_completed(list(pending)))
+                if lost:
+                    executor = recover(executor, lost)
+        finally:
+            executor.shutdown()
+
+    def _task_failed(
+        self,
+        source_path: Path,
+        error: Exception
+    ) -> Tuple[array.array, List[str]]:
+        """Record a document whose processing raised an exception.
+
+        Args:
+            source_path: Path to the source document
+            error: Exception raised while processing it
+
+        Returns:
+            Counters and messages in the same form _merge_one returns them
+        """
+        logger.error("Error processing %s: %s", source_path.name, error)
+        counters = _new_counters()
+        counters[S_ERRORS] = 1
+        return counters, [f"  Error processing {source_path.name}: {error}"]
+
+    def _merge_stats(self, result: Tuple[array.array, List[str]]) -> None:
+        """Add the counters and messages returned by a worker.
+
+        Messages are buffered and written every LOG_FLUSH_INTERVAL documents.
+        """
+        counters, lines = result
+        for index, value in enumerate(counters):
+            self._stats[index] += value
+
+        self._log_buf.extend(lines)
+        self._log_buf_docs += 1
+        if self._log_buf_docs >= LOG_FLUSH_INTERVAL:
+            self._flush_log()
+
+    def _flush_log(self) -> None:
+        """Write buffered progress messages to stdout in a single call."""
+        if self._log_buf:
+            sys.stdout.write("\n".join(self._log_buf) + "\n")
+            sys.stdout.flush()
+            self._log_buf.clear()
+        self._log_buf_docs = 0
@@ -2,13 +2,57 @@
 
 import os
 import re
+import stat
+import fnmatch
+import functools
 import logging
 import datetime
 from pathlib import Path
-from typing import Optional, List, Pattern, Dict, Any
+from typing import Optional, List, Pattern, Dict, Any, Iterable, Iterator, Tuple, Callable
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_ID_PATTERN = r"^[A-Za-z]\d+$"
+_DEFAULT_ID_RE = re.compile(DEFAULT_ID_PATTERN, re.IGNORECASE)
+# The default pattern applied to the first word of a filename in one pass:
+# skip leading whitespace, capture the ID, and require the word to end at a
+# space (or the end of the name), possibly after other trailing whitespace
+_FUSED_DEFAULT_ID_RE = re.compile(r"\s*([A-Za-z]\d+)(?=\s*(?: |$))", re.IGNORECASE)
+
+@functools.lru_cache(maxsize=4096)
+def _cached_mtime(path_str: str) -> float:
+    """Return the modification time of a file, statting each path only once."""
+    return os.stat(path_str).st_mtime
+
+
+def clear_file_date_cache() -> None:
+    """Forget the cached modification times used by get_file_date.
+
+    Call this after modifying files whose dates are read again.
+    """
+    _cached_mtime.cache_clear()
+
+
+@functools.lru_cache(maxsize=4096)
+def _date_from_seconds(seconds: int) -> datetime.date:
+    """Return the local date of a whole-second timestamp."""
+    return datetime.date.fromtimestamp(seconds)
+
+
+def date_from_timestamp(timestamp: float) -> datetime.date:
+    """Convert a timestamp to a local date.
+
+    Dates are cached per whole second, which many files in a batch share.
+
+    Args:
+        timestamp: Seconds since the epoch, e.g. an st_mtime
+
+    Returns:
+        Local date of the timestamp
+    """
+    return _date_from_seconds(int(timestamp // 1))
+
+
 def get_file_date(file_path: Path) -> Optional[datetime.date]:
     """Get the modification date of a file.
     
@@ -17,23 +61,195 @@ def get_file_date(file_path: Path) -> Optional[datetime.date]:
         
     Returns:
         Date of last modification or None if error
+
+    Modification times are cached per path, see clear_file_date_cache.
     """
     try:
-        if not file_path.exists():
-            logger.warning(f"File does not exist: {file_path}")
-            return None
-            
-        file_mtime_ts = os.path.getmtime(file_path)
-        return datetime.date.fromtimestamp(file_mtime_ts)
+        # A single stat; a missing file shows up as FileNotFoundError
+        file_mtime_ts = _cached_mtime(str(file_path))
+        return date_from_timestamp(file_mtime_ts)
+    except FileNotFoundError:
+        logger.warning("File does not exist: %s", file_path)
+        return None
     except Exception as e:
-        logger.warning(f"Could not get date for {file_path.name}: {e}")
+        logger.warning("Could not get date for %s: %s", file_path.name, e)
         print(f"Warning: Could not get date for {file_path.name}. Error: {e}")
         return None
 
 
+@functools.lru_cache(maxsize=256)
+def _glob_matcher(pattern: str) -> Callable[[str], Any]:
+    """Compile a glob-style file name pattern into a regex match function.
+
+    Compiled matchers are cached, so repeated scans with the same pattern
+    skip fnmatch.translate and re.compile.
+    """
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return re.compile(fnmatch.translate(pattern), flags).match
+
+
+class ListedEntry:
+    """Minimal stand-in for os.DirEntry for a file given by its path.
+
+    Lets explicitly listed files go through the same code as scanned ones.
+    The stat() result is cached like DirEntry's.
+    """
+
+    __slots__ = ("path", "name", "_stat")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        self._stat: Optional[os.stat_result] = None
+
+    def stat(self) -> os.stat_result:
+        """Return the (cached) stat result of the file."""
+        if self._stat is None:
+            self._stat = os.stat(self.path)
+        return self._stat
+
+
+def iter_listed_entries(
+    paths: Iterable[Path],
+    pattern: str = "*.pdf",
+    on_error: Optional[Callable[[str, str], None]] = None
+) -> Iterator[ListedEntry]:
+    """Yield entries for listed files that exist and match a pattern.
+
+    Args:
+        paths: Paths of the files to consider
+        pattern: Glob-style pattern that file names must match
+        on_error: Called with the path and the reason for each matching
+            file that is missing, unreadable or not a regular file; such
+            files are only logged and skipped if not given
+
+    Yields:
+        ListedEntry for each existing, matching regular file
+    """
+    name_matches = _glob_matcher(pattern)
+    for path in paths:
+        entry = ListedEntry(os.fspath(path))
+        if not name_matches(entry.name):
+            continue
+        try:
+            is_file = stat.S_ISREG(entry.stat().st_mode)
+        except OSError as e:
+            reason = str(e)
+        else:
+            if is_file:
+                yield entry
+                continue
+            reason = "not a regular file"
+        if on_error is not None:
+            on_error(entry.path, reason)
+        else:
+            logger.warning("Skipping %s: %s", entry.path, reason)
+            print(f"Warning: Skipping {entry.path}: {reason}")
+
+
+def iter_pdf_entries(
+    folder: Path,
+    pattern: str = "*.pdf",
+    recursive: bool = False,
+    exclude_dirs: Iterable[Path] = ()
+) -> Iterator[os.DirEntry]:
+    """Walk a folder once, yielding the directory entries of matching files.
+
+    Uses os.scandir so the file-type check comes from the directory entry,
+    and callers can read the modification time from the entry's cached
+    stat() result instead of statting each path again.
+
+    Args:
+        folder: Folder to scan
+        pattern: Glob-style pattern that file names must match
+        recursive: Whether to descend into subfolders
+        exclude_dirs: Subfolders not to descend into (with everything below
+            them), e.g. an output folder that is written during the walk
+
+    Yields:
+        os.DirEntry for each matching file
+    """
+    name_matches = _glob_matcher(pattern)
+    pending = [os.fspath(folder)]
+
+    # Folders are compared by device and inode, so other paths to the same
+    # folder are excluded too
+    excluded = set()
+    for path in exclude_dirs:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        excluded.add((st.st_dev, st.st_ino))
+
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if recursive and entry.is_dir(follow_symlinks=False):
+                        if excluded:
+                            st = entry.stat(follow_symlinks=False)
+                            if (st.st_dev, st.st_ino) in excluded:
+                                continue
+                        pending.append(entry.path)
+                        continue
+                    if name_matches(entry.name) and entry.is_file():
+                        yield entry
+        except OSError as e:
+            logger.error("Error scanning folder %s: %s", current, e)
+            print(f"Error scanning folder {current}: {e}")
+
+
+def _match_split_id(id_re: Pattern, filename: str) -> Optional[str]:
+    """Return the first word of filename if it matches id_re."""
+    potential_id = filename.lstrip().partition(" ")[0].rstrip()
+    return potential_id if potential_id and id_re.match(potential_id) else None
+
+
+def _match_fused_id(fused_re: Pattern, filename: str) -> Optional[str]:
+    """Return the ID captured by a regex built in compile_id_matcher."""
+    match = fused_re.match(filename)
+    return match.group(1) if match else None
+
+
+def compile_id_matcher(
+    pattern: str = DEFAULT_ID_PATTERN
+) -> Callable[[str], Optional[str]]:
+    """Build a function that reads the ID off a filename.
+
+    The ID is the first space-separated word of the filename, checked with
+    re.match as in extract_id_from_filename. For the default pattern the
+    whitespace skipping, word boundary and pattern check are fused into a
+    single anchored regex so no temporary strings are created; any other
+    pattern is matched against the split-off first word, since rewriting
+    an arbitrary regex could change its meaning.
+
+    Args:
+        pattern: Regex pattern for the ID
+
+    Returns:
+        Picklable function mapping a filename to its ID, or None if it has none
+
+    Raises:
+        re.error: If the pattern is not a valid regex
+    """
+    if pattern == DEFAULT_ID_PATTERN:
+        return functools.partial(_match_fused_id, _FUSED_DEFAULT_ID_RE)
+    return functools.partial(_match_split_id, _get_id_re(pattern))
+
+
+@functools.lru_cache(maxsize=64)
+def _get_id_re(pattern: str) -> Pattern:
+    """Return the compiled, case-insensitive regex for an ID pattern."""
+    if pattern == DEFAULT_ID_PATTERN:
+        return _DEFAULT_ID_RE
+    return re.compile(pattern, re.IGNORECASE)
+
+
 def extract_id_from_filename(
     filename: str, 
-    pattern: str = r"^[A-Za-z]\d+$"
+    pattern: str = DEFAULT_ID_PATTERN
 ) -> Optional[str]:
     """Extract an ID from a filename based on a regex pattern.
     
@@ -48,22 +264,77 @@ def extract_id_from_filename(
         if not filename:
             return None
             
-        clean_filename = filename.strip()
-        parts = clean_filename.split(" ", 1)
-        if parts:
-            potential_id = parts[0].strip()
-            if re.match(pattern, potential_id, re.IGNORECASE):
-                logger.debug(f"Extracted ID '{potential_id}' from '{filename}'")
-                return potential_id
+        # First space-separated word, without building a list of parts
+        potential_id = filename.lstrip().partition(" ")[0].rstrip()
+        if potential_id and _get_id_re(pattern).match(potential_id):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Extracted ID %r from %r", potential_id, filename)
+            return potential_id
                 
-        logger.debug(f"No ID matching pattern '{pattern}' found in '{filename}'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("No ID matching pattern %r found in %r", pattern, filename)
         return None
     except Exception as e:
-        logger.error(f"Error extracting ID from filename '{filename}': {e}")
+        logger.error("Error extracting ID from filename %r: %s", filename, e)
         print(f"Error extracting ID from filename '{filename}': {e}")
         return None
 
 
+def _iter_id_entries(
+    folder: Path,
+    extension: str,
+    id_re: Optional[Pattern] = None
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    """Yield the files of a folder named "<ID> ...<extension>" with their ID key.
+
+    Every lookup of files by ID goes through this scan, so they all follow
+    the same rules: the ID is the first word of the name and is compared
+    like the file system compares names (os.path.normcase), the extension
+    is compared case-insensitively, and symlinks to files count as files.
+    The file type comes from the directory entry where the file system
+    reports it, so regular files are not statted.
+
+    Args:
+        folder: Folder to scan
+        extension: File extension to filter by
+        id_re: Compiled pattern the first word must match, or None to
+            accept any first word
+
+    Yields:
+        (key, entry) tuples, key being the normcased first word
+
+    Raises:
+        OSError: If the folder cannot be read
+    """
+    ext = extension.lower()
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.lower().endswith(ext):
+                continue
+            id_value, sep, _ = name.partition(" ")
+            if not sep or (id_re is not None and not id_re.match(id_value)):
+                continue
+            if entry.is_file():
+                yield os.path.normcase(id_value), entry
+
+
+def _scan_id_entries(
+    folder: Path,
+    id_value: str,
+    extension: str
+) -> List[os.DirEntry]:
+    """Return the directory entries of files named "<id_value> ...<extension>".
+
+    Raises:
+        OSError: If the folder cannot be read
+    """
+    key = os.path.normcase(id_value)
+    matching = [entry for entry_key, entry in _iter_id_entries(folder, extension) if entry_key == key]
+    matching.sort(key=lambda entry: entry.name)
+    return matching
+
+
 def find_matching_files(
     folder: Path, 
     id_value: str, 
@@ -81,22 +352,161 @@ def find_matching_files(
     """
     try:
         if not folder or not folder.exists():
-            logger.warning(f"Folder does not exist: {folder}")
+            logger.warning("Folder does not exist: %s", folder)
             return []
             
         if not id_value:
             logger.warning("Empty ID value provided")
             return []
             
-        pattern = f"{re.escape(id_value)} *{extension}"
-        logger.debug(f"Searching for files matching pattern '{pattern}' in {folder}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Searching for files matching '%s *%s' in %s", id_value, extension, folder)
+        matching_files = [Path(entry.path) for entry in _scan_id_entries(folder, id_value, extension)]
         
-        matching_files = list(folder.glob(pattern))
-        matching_files.sort()
-        
-        logger.info(f"Found {len(matching_files)} files matching ID '{id_value}'")
+        logger.info("Found %d files matching ID '%s'", len(matching_files), id_value)
+        return matching_files
+    except Exception as e:
+        logger.error("Error searching for files matching '%s': %s", id_value, e)
+        print(f"Error searching for files matching '{id_value}': {e}")
+        return []
+
+
+def find_matching_files_with_dates(
+    folder: Path,
+    id_value: str,
+    extension: str = ".pdf"
+) -> List[Tuple[Path, datetime.date]]:
+    """Find files matching an ID pattern together with their modification dates.
+
+    Same as calling get_file_date on each result of find_matching_files,
+    but the dates are read from the directory entries found by the scan
+    instead of statting every path again.
+
+    Args:
+        folder: Folder to search in
+        id_value: ID to match at the start of filenames
+        extension: File extension to filter by
+
+    Returns:
+        List of (file path, date of last modification) tuples
+    """
+    try:
+        if not folder or not folder.exists():
+            logger.warning("Folder does not exist: %s", folder)
+            return []
+
+        if not id_value:
+            logger.warning("Empty ID value provided")
+            return []
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Searching for files matching '%s *%s' in %s", id_value, extension, folder)
+        matching_files = [
+            (Path(entry.path),
+             date_from_timestamp(entry.stat().st_mtime))
+            for entry in _scan_id_entries(folder, id_value, extension)
+        ]
+
+        logger.info("Found %d files matching ID '%s'", len(matching_files), id_value)
         return matching_files
     except Exception as e:
-        logger.error(f"Error searching for files matching '{id_value}': {e}")
+        logger.error("Error searching for files matching '%s': %s", id_value, e)
         print(f"Error searching for files matching '{id_value}': {e}")
         return []
+
+
+def find_matching_files_bulk(
+    folder: Path,
+    id_values: Iterable[str],
+    extension: str = ".pdf"
+) -> Dict[str, List[Path]]:
+    """Find the files matching each of several IDs in a single folder scan.
+
+    Gives the same result as calling find_matching_files for every ID, but
+    the folder is indexed once by FolderIndex instead of being scanned
+    again for every ID.
+
+    Args:
+        folder: Folder to search in
+        id_values: IDs to match at the start of filenames
+        extension: File extension to filter by
+
+    Returns:
+        Dict mapping each ID to its list of matching file paths (sorted by
+        name, empty if nothing matched)
+    """
+    id_values = [id_value for id_value in id_values if id_value]
+    try:
+        if not folder or not folder.exists():
+            logger.warning("Folder does not exist: %s", folder)
+            return {id_value: [] for id_value in id_values}
+
+        logger.debug("Searching for files matching %d IDs in %s", len(id_values), folder)
+        index = FolderIndex(folder, extension, id_re=None)
+        matches = {id_value: index.get(id_value) for id_value in id_values}
+
+        logger.info("Found %d files matching %d IDs", sum(map(len, matches.values())), len(matches))
+        return matches
+    except Exception as e:
+        logger.error("Error searching for files in %s: %s", folder, e)
+        print(f"Error searching for files in {folder}: {e}")
+        return {id_value: [] for id_value in id_values}
+
+
+class FolderIndex:
+    """Index of the files in a folder by the ID their names start with.
+
+    The folder is read once; afterwards looking up the files for an ID is
+    a dict lookup instead of another directory scan, which pays off when
+    many IDs are looked up in the same folder.
+    """
+
+    def __init__(
+        self,
+        folder: Path,
+        extension: str = ".pdf",
+        id_re: Optional[Pattern] = _DEFAULT_ID_RE
+    ):
+        """Scan a folder and index its files.
+
+        Args:
+            folder: Folder to index
+            extension: File extension to filter by
+            id_re: Compiled pattern the first word of a filename must match
+                to be indexed, or None to index every first word
+
+        Raises:
+            OSError: If the folder cannot be read
+        """
+        self.folder = folder
+        # Keyed by normcased ID, each list sorted by file name
+        self.by_id: Dict[str, List[Path]] = {}
+
+        # Collect path strings and only build Path objects once sorted
+        found: Dict[str, List[str]] = {}
+        for key, entry in _iter_id_entries(folder, extension, id_re):
+            found.setdefault(key, []).append(entry.path)
+
+        # All paths share the folder prefix, so sorting them sorts by name
+        for key, paths in found.items():
+            paths.sort()
+            self.by_id[key] = [Path(path) for path in paths]
+
+        logger.debug("Indexed %d IDs in %s", len(self.by_id), folder)
+
+    def get(self, id_value: str) -> List[Path]:
+        """Return the files whose names start with an ID.
+
+        IDs are compared like file names on this system: case-sensitively
+        on POSIX, case-insensitively on Windows.
+
+        Args:
+            id_value: ID to look up
+
+        Returns:
+            List of matching file paths sorted by name, empty if none match
+        """
+        return self.by_id.get(os.path.normcase(id_value), [])
+
+    def __len__(self) -> int:
+        return len(self.by_id)
@@ -1,5 +1,6 @@
 """GUI utilities for file and folder selection."""
 
+import atexit
 import logging
 import os
 import tkinter as tk
@@ -9,6 +10,9 @@ from typing import Optional, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Hidden root window shared by all dialogs, created on first use
+_TK_ROOT: Optional[tk.Tk] = None
+
 def initialize_tk_root() -> tk.Tk:
     """Initialize and hide the Tkinter root window."""
     try:
@@ -25,6 +29,30 @@ def initialize_tk_root() -> tk.Tk:
         raise
 
 
+def _get_root() -> tk.Tk:
+    """Return the shared hidden root window, creating it on first use."""
+    global _TK_ROOT
+    if _TK_ROOT is None:
+        _TK_ROOT = initialize_tk_root()
+        atexit.register(shutdown_tk)
+    return _TK_ROOT
+
+
+def shutdown_tk() -> None:
+    """Destroy the shared root window, if one was created.
+
+    Called automatically at exit; a later dialog creates a new root.
+    """
+    global _TK_ROOT
+    if _TK_ROOT is None:
+        return
+    root, _TK_ROOT = _TK_ROOT, None
+    try:
+        root.destroy()
+    except tk.TclError as e:
+        logger.debug(f"Tk root already destroyed: {e}")
+
+
 def select_folder(title: str, initial_dir: str = ".") -> Optional[Path]:
     """Open a folder selection dialog and return the selected path.
     
@@ -44,9 +72,8 @@ def select_folder(title: str, initial_dir: str = ".") -> Optional[Path]:
     print(f"--> Please select: {title}")
     
     try:
-        root = initialize_tk_root()
-        folder_path = filedialog.askdirectory(title=title, initialdir=initial_dir)
-        root.destroy()
+        root = _get_root()
+        folder_path = filedialog.askdirectory(parent=root, title=title, initialdir=initial_dir)
         
         if folder_path:
             logger.info(f"Selected folder: {folder_path}")
@@ -86,13 +113,13 @@ def select_file(
     print(f"--> Please select: {title}")
     
     try:
-        root = initialize_tk_root()
+        root = _get_root()
         file_path = filedialog.askopenfilename(
+            parent=root,
             title=title, 
             filetypes=filetypes,
             initialdir=initial_dir
         )
-        root.destroy()
         
         if file_path:
             logger.info(f"Selected file: {file_path}")
@@ -1,93 +1,565 @@
 """PDF operations for the document processor."""
 
+import contextlib
+import functools
+import importlib
 import logging
+import mmap
+import os
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict, Any
-from pypdf import PdfWriter, PdfReader
+from typing import Optional, Tuple, List, Dict, Any, Iterator, BinaryIO
 
 logger = logging.getLogger(__name__)
 
+# Supported merge backends, mapped to the module each one needs
+PDF_BACKENDS = {
+    "pypdfium2": "pypdfium2",
+    "pymupdf": "pymupdf",
+    "pypdf": "pypdf",
+}
+DEFAULT_PDF_BACKEND = "pypdfium2"
+
+# Upper bound on threads parsing pypdf sources ahead of a merge
+MAX_PREFETCH_THREADS = 8
+
+# Write buffer for merged files, so large outputs take few write() calls
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Marker every PDF file starts with
+PDF_HEADER = b"%PDF-"
+
+# Documents parsed once per process and reused across merges,
+# keyed by (backend, path)
+_shared_documents: Dict[Tuple[str, str], Any] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_backend(backend: str) -> str:
+    """Return the backend to use, falling back to pypdf if it is not installed.
+
+    Args:
+        backend: Name of the requested backend
+
+    Returns:
+        Name of an importable backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {backend}")
+
+    if backend != "pypdf":
+        try:
+            importlib.import_module(PDF_BACKENDS[backend])
+        except ImportError:
+            logger.warning(f"PDF backend '{backend}' is not installed, falling back to pypdf")
+            return "pypdf"
+    return backend
+
+
+def _echo(out: Optional[List[str]], message: str) -> None:
+    """Print a progress message, or collect it in out if a list is given."""
+    if out is None:
+        print(message)
+    else:
+        out.append(message)
+
+
+def _open_document(backend: str, path: Path) -> Any:
+    """Open a source document with the given backend's own reader.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    if backend == "pypdfium2":
+        import pypdfium2 as pdfium
+        return pdfium.PdfDocument(str(path))
+    if backend == "pymupdf":
+        import pymupdf
+        try:
+            return pymupdf.open(str(path))
+        except pymupdf.FileNotFoundError as e:
+            # PyMuPDF's own exception does not derive from the builtin one
+            raise FileNotFoundError(str(e)) from e
+
+    from pypdf import PdfReader
+    return PdfReader(str(path))
+
+
+def _shared_document(backend: str, path: Path) -> Any:
+    """Return a document that is parsed once per process and then reused.
+
+    Args:
+        backend: Backend the document is opened with
+        path: Path to the document
+
+    Returns:
+        Open document object of the backend
+    """
+    key = (backend, str(path))
+    document = _shared_documents.get(key)
+    if document is None:
+        logger.debug(f"Opening shared document: {path}")
+        document = _shared_documents[key] = _open_document(backend, path)
+    return document
+
+
+def close_shared_documents() -> None:
+    """Close all documents cached for reuse across merges."""
+    for document in _shared_documents.values():
+        close = getattr(document, "close", None)
+        if close:
+            close()
+    _shared_documents.clear()
+
+
+def _iter_files(
+    files_to_merge: List[Dict[str, Any]],
+    out: Optional[List[str]]
+) -> Iterator[Tuple[Path, Any, str, bool]]:
+    """Yield (path, pages, description, shared) for each file to merge.
+
+    Files are not checked for existence here; the backends open them
+    directly and report missing ones with _skip_missing.
+    """
+    for file_info in files_to_merge:
+        path = file_info['path']
+        pages = file_info.get('pages')
+        desc = file_info.get('description', path.name)
+        shared = file_info.get('shared', False)
+
+        logger.info(f"Adding: {desc}")
+        _echo(out, f"  Adding: {desc}")
+
+        yield path, pages, desc, shared
+
+
+def _skip_missing(path: Path, out: Optional[List[str]]) -> None:
+    """Report a file to merge that turned out not to exist."""
+    logger.warning(f"File does not exist: {path}")
+    _echo(out, f"  Warning: File does not exist: {path}. Skipping.")
+
+
+def _open_source(backend: str, path: Path, shared: bool, out: Optional[List[str]]) -> Any:
+    """Open a file to merge, or return None (after a warning) if it is missing."""
+    try:
+        if shared:
+            return _shared_document(backend, path)
+        return _open_document(backend, path)
+    except FileNotFoundError:
+        _skip_missing(path, out)
+        return None
+
+
+def _page_range(
+    pages: Optional[Tuple[int, int]],
+    total_pages: int,
+    desc: str,
+    out: Optional[List[str]]
+) -> Optional[Tuple[int, int]]:
+    """Resolve a requested page range against the actual page count.
+
+    Args:
+        pages: Tuple of (start, end) page indices, both inclusive, where a
+            negative end counts from the back; None selects all pages
+        total_pages: Number of pages in the document
+        desc: Description of the file for logging
+        out: List collecting progress messages, or None to print them
+
+    Returns:
+        Tuple of in-bounds (start, end) indices, or None if nothing to add
+    """
+    if total_pages == 0:
+        logger.warning(f"{desc} has no pages")
+        _echo(out, f"  Warning: {desc} has no pages. Skipping.")
+        return None
+
+    if not pages:
+        return 0, total_pages - 1
+
+    # Handle negative indices for end page
+    start_page, end_page = pages
+    if end_page < 0:
+        end_page = total_pages + end_page
+
+    if end_page >= total_pages:
+        logger.warning(f"{desc} has {total_pages} pages, requested up to {end_page}")
+        _echo(out, f"  Warning: {desc} has fewer pages than requested. Using all available pages.")
+        end_page = total_pages - 1
+
+    if start_page > end_page:
+        logger.warning(f"{desc} has no pages in the requested range")
+        _echo(out, f"  Warning: {desc} has no pages in the requested range. Skipping.")
+        return None
+
+    return start_page, end_page
+
+
+@contextlib.contextmanager
+def _open_mapped(path: Path) -> Iterator[Any]:
+    """Open a file for reading through a read-only memory map.
+
+    Parsers can then seek and read straight from the page cache instead of
+    going through buffered read() calls. Empty files cannot be mapped, so
+    the plain file object is used for those.
+
+    Args:
+        path: File to open
+
+    Yields:
+        Memory map (or file object) positioned at the start of the file
+    """
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield f
+            return
+        with mapped:
+            yield mapped
+
+
+def _temp_output_path(output_path: Path) -> Path:
+    """Get the file a merge writes to before it is renamed to output_path."""
+    return output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+
+
+def _open_output(output_path: Path, out: Optional[List[str]]) -> BinaryIO:
+    """Create the output folder, announce the save and open the output file.
+
+    The data goes to a temporary file next to output_path, which
+    merge_pdf_files renames once the sources are closed: a source that is
+    still mapped cannot be replaced on Windows.
+
+    Returns:
+        Temporary output file opened for writing with a large buffer
+    """
+    # Create parent directories if they don't exist
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    logger.info(f"Saving merged file to: {output_path}")
+    _echo(out, f"  Saving merged file to: {output_path}")
+    return open(_temp_output_path(output_path), "wb", buffering=OUTPUT_BUFFER_SIZE)
+
+
+def _merge_with_pdfium(
+    files_to_merge: List[Dict[str, Any]],
+    output_path: Path,
+    out: Optional[List[str]],
+    compress: bool = False
+) -> None:
+    """Merge files with pypdfium2 (PDFium).
+
+    Each source is closed as soon as its pages are imported, so only one
+    source document is open at a time. PDFium's save has no compression
+    options, so compress is ignored.
+    """
+    import pypdfium2 as pdfium
+
+    merged = pdfium.PdfDocument.new()
+    try:
+        for path, pages, desc, shared in _iter_files(files_to_merge, out):
+            source = _open_source("pypdfium2", path, shared, out)
+            if source is None:
+                continue
+            try:
+                page_range = _page_range(pages, len(source), desc, out)
+                if page_range:
+                    start_page, end_page = page_range
+                    merged.import_pages(source, pages=list(range(start_page, end_page + 1)))
+            finally:
+                if not shared:
+                    source.close()
+
+        with _open_output(output_path, out) as output_file:
+            merged.save(output_file)
+    finally:
+        merged.close()
+
+
+def _select_toc(
+    toc: List[List[Any]],
+    start_page: int,
+    end_page: int,
+    shift: int
+) -> List[List[Any]]:
+    """Keep the outline entries pointing into a page range, renumbered.
+
+    Args:
+        toc: Outline as returned by PyMuPDF's get_toc(simple=True), with
+            1-based page numbers
+        start_page: First page of the range (0-based, inclusive)
+        end_page: Last page of the range (0-based, inclusive)
+        shift: Amount to add to the page numbers of the kept entries
+
+    Returns:
+        Outline entries for set_toc(); levels are lowered where the parent
+        entry fell outside the range, so the hierarchy stays valid
+    """
+    entries = []
+    last_level = 0
+    for level, title, page in toc:
+        if not start_page < page <= end_page + 1:
+            continue
+        level = min(level, last_level + 1)
+        entries.append([level, title, page + shift])
+        last_level = level
+    return entries
+
+
+def _merge_with_pymupdf(
+    files_to_merge: List[Dict[str, Any]],
+    output_path: Path,
+    out: Optional[List[str]],
+    compress: bool = False
+) -> None:
+    """Merge files with PyMuPDF (MuPDF).
+
+    Each source is closed as soon as its pages are inserted, so only one
+    source document is open at a time. insert_pdf() does not copy outlines,
+    so the bookmarks of the inserted pages are carried over separately.
+    With compress, duplicate objects are merged and uncompressed streams
+    deflated on save.
+    """
+    import pymupdf
+
+    merged = pymupdf.open()
+    toc: List[List[Any]] = []
+    try:
+        for path, pages, desc, shared in _iter_files(files_to_merge, out):
+            source = _open_source("pymupdf", path, shared, out)
+            if source is None:
+                continue
+            try:
+                page_range = _page_range(pages, source.page_count, desc, out)
+                if page_range:
+                    start_page, end_page = page_range
+                    offset = merged.page_count
+                    merged.insert_pdf(source, from_page=start_page, to_page=end_page)
+                    toc.extend(_select_toc(
+                        source.get_toc(simple=True), start_page, end_page, offset - start_page
+                    ))
+            finally:
+                if not shared:
+                    source.close()
+
+        if toc:
+            merged.set_toc(toc)
+
+        with _open_output(output_path, out) as output_file:
+            if compress:
+                merged.save(output_file, garbage=3, deflate=True)
+            else:
+                merged.save(output_file)
+    finally:
+        merged.close()
+
+
+def _compress_pypdf(merger: Any) -> None:
+    """Deflate the page contents of a pypdf writer and merge identical objects."""
+    for page in merger.pages:
+        page.compress_content_streams()
+    # Only available in newer pypdf versions
+    compress_identical_objects = getattr(merger, "compress_identical_objects", None)
+    if compress_identical_objects:
+        compress_identical_objects()
+
+
+def _read_mapped_pdf(path: Path, sources: contextlib.ExitStack) -> Any:
+    """Parse a PDF from a memory map that stays open as long as sources."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(sources.enter_context(_open_mapped(path)), strict=False)
+    len(reader.pages)  # Load the page tree while still in the worker thread
+    return reader
+
+
+def _merge_with_pypdf(
+    files_to_merge: List[Dict[str, Any]],
+    output_path: Path,
+    out: Optional[List[str]],
+    compress: bool = False
+) -> None:
+    """Merge files with pypdf.
+
+    Sources are parsed from read-only memory maps rather than loaded into
+    memory up front, and the result is written straight to the output file.
+    Every source stays open, and its reader referenced, until the output is
+    written: pypdf tracks copied objects by id() of their reader, so a
+    reader freed mid-merge could have its id reused by the next one.
+
+    When several sources are merged, they are parsed in a thread pool
+    ahead of the merge loop, which still consumes them in their original
+    order; the writer itself is only used from the calling thread. A file
+    listed more than once gets a reader per occurrence: with a shared
+    reader, pypdf would point the bookmarks of every copy at the first one.
+
+    With compress, page content streams are deflated and identical objects
+    merged before writing.
+    """
+    from pypdf import PdfWriter
+
+    merger = PdfWriter()
+    # Kept until the output is written
+    readers = []
+    needs_reader = [
+        bool(file_info.get('pages')) or not file_info.get('shared', False)
+        for file_info in files_to_merge
+    ]
+    try:
+        with contextlib.ExitStack() as sources:
+            workers = min(MAX_PREFETCH_THREADS, sum(needs_reader))
+            pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+            try:
+                prefetched: List[Optional[Future]] = [
+                    pool.submit(_read_mapped_pdf, file_info['path'], sources)
+                    if pool and needed else None
+                    for file_info, needed in zip(files_to_merge, needs_reader)
+                ]
+
+                for (path, pages, desc, shared), future in zip(_iter_files(files_to_merge, out), prefetched):
+                    if shared and not pages:
+                        source = _open_source("pypdf", path, shared, out)
+                        if source is not None:
+                            merger.append(source)
+                        continue
+
+                    # Parse each source once and copy pages from that reader,
+                    # rather than having append() parse the file a second time
+                    try:
+                        reader = future.result() if future else _read_mapped_pdf(path, sources)
+                    except FileNotFoundError:
+                        _skip_missing(path, out)
+                        continue
+                    readers.append(reader)
+                    if pages:
+                        page_range = _page_range(pages, len(reader.pages), desc, out)
+                        if page_range:
+                            # append() takes an exclusive end, and copies the
+                            # bookmarks of the selected pages as well
+                            start_page, end_page = page_range
+                            merger.append(reader, pages=(start_page, end_page + 1))
+                    else:
+                        merger.append(reader)
+            finally:
+                # Wait for any parse still running before the maps are closed
+                if pool:
+                    pool.shutdown()
+
+            if compress:
+                _compress_pypdf(merger)
+
+            with _open_output(output_path, out) as output_file:
+                merger.write(output_file)
+    finally:
+        try:
+            merger.close()
+        except Exception as e:
+            logger.error(f"Error closing PDF writer: {e}")
+            _echo(out, f"Error closing PDF writer: {e}")
+
+
+def _copy_single_file(
+    file_info: Dict[str, Any],
+    output_path: Path,
+    out: Optional[List[str]]
+) -> bool:
+    """Write a one-file "merge" by copying the file byte for byte.
+
+    Only the PDF header is checked, so a damaged file that starts like a
+    PDF is copied as-is instead of failing to parse.
+
+    Returns:
+        True if the file was copied, False if the caller should fall back
+        to a regular merge: when the file does not exist (so its warning is
+        reported) or does not look like a PDF (so the merge reports the
+        error)
+    """
+    path = file_info['path']
+    try:
+        source = open(path, "rb")
+    except FileNotFoundError:
+        return False
+
+    with source:
+        # PDF readers accept the header anywhere in the first 1024 bytes
+        if PDF_HEADER not in source.read(1024):
+            return False
+        source.seek(0)
+
+        desc = file_info.get('description', path.name)
+        logger.info(f"Adding: {desc}")
+        _echo(out, f"  Adding: {desc}")
+
+        with _open_output(output_path, out) as output_file:
+            shutil.copyfileobj(source, output_file, OUTPUT_BUFFER_SIZE)
+    return True
+
+
+_MERGERS = {
+    "pypdfium2": _merge_with_pdfium,
+    "pymupdf": _merge_with_pymupdf,
+    "pypdf": _merge_with_pypdf,
+}
+
+
 def merge_pdf_files(
-    files_to_merge: List[Dict[str, Any]], 
-    output_path: Path
+    files_to_merge: List[Dict[str, Any]],
+    output_path: Path,
+    backend: str = DEFAULT_PDF_BACKEND,
+    out: Optional[List[str]] = None,
+    compress: bool = False
 ) -> bool:
     """Merge multiple PDF files into a single output file.
-    
+
     Args:
         files_to_merge: List of dicts with file info:
             {
                 'path': Path object,
                 'pages': Optional tuple of (start, end) pages or None for all
-                'description': String description for logging
+                'description': String description for logging,
+                'shared': Optional flag to parse the file once per process
+                    and reuse it in later merges (e.g. a common appendix)
             }
         output_path: Path where to save the merged PDF
-        
+        backend: PDF library to merge with ("pypdfium2", "pymupdf" or
+            "pypdf"); falls back to pypdf if the library is not installed
+        out: Optional list that collects progress messages instead of
+            printing them
+        compress: Whether to spend extra time making the output smaller
+            (deflating content streams and merging duplicate objects);
+            not supported by pypdfium2. Sources are copied as-is otherwise.
+
     Returns:
         True if successful, False otherwise
+
+    A single file without a page range is copied as-is instead of being
+    parsed and rewritten (unless compress is set); only its PDF header is
+    checked. Output is written to a temporary file in the output folder
+    and renamed over output_path once complete, so a source can also be
+    the output file.
     """
     if not files_to_merge:
         logger.error("No files provided to merge")
         return False
-        
-    merger = None
+
+    temp_path = _temp_output_path(output_path)
     try:
-        merger = PdfWriter()
-        
-        for file_info in files_to_merge:
-            path = file_info['path']
-            pages = file_info.get('pages')
-            desc = file_info.get('description', path.name)
-            
-            logger.info(f"Adding: {desc}")
-            print(f"  Adding: {desc}")
-            
-            if not path.exists():
-                logger.warning(f"File does not exist: {path}")
-                print(f"  Warning: File does not exist: {path}. Skipping.")
-                continue
-                
-            if pages:
-                with open(path, "rb") as f:
-                    reader = PdfReader(f)
-                    total_pages = len(reader.pages)
-                    
-                    # Handle negative indices for end page
-                    start_page, end_page = pages
-                    if end_page < 0:
-                        end_page = total_pages + end_page
-                        
-                    if total_pages > 0:
-                        if end_page >= total_pages:
-                            logger.warning(f"{desc} has {total_pages} pages, requested up to {end_page}")
-                            print(f"  Warning: {desc} has fewer pages than requested. Using all available pages.")
-                            merger.append(fileobj=f, pages=(start_page, total_pages-1))
-                        else:
-                            merger.append(fileobj=f, pages=pages)
-                    else:
-                        logger.warning(f"{desc} has no pages")
-                        print(f"  Warning: {desc} has no pages. Skipping.")
-            else:
-                merger.append(str(path))
-        
-        # Create parent directories if they don't exist
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        logger.info(f"Saving merged file to: {output_path}")
-        print(f"  Saving merged file to: {output_path}")
-        merger.write(str(output_path))
+        # A single whole document needs no PDF processing at all
+        if not (len(files_to_merge) == 1 and not files_to_merge[0].get('pages') and not compress
+                and _copy_single_file(files_to_merge[0], output_path, out)):
+            _MERGERS[resolve_backend(backend)](files_to_merge, output_path, out, compress)
+
+        os.replace(temp_path, output_path)
         return True
-        
     except Exception as e:
         logger.error(f"Error merging PDFs: {e}", exc_info=True)
-        print(f"Error merging PDFs: {e}")
+        _echo(out, f"Error merging PDFs: {e}")
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
         return False
-    finally:
-        if merger:
-            try:
-                merger.close()
-            except Exception as e:
-                logger.error(f"Error closing PDF writer: {e}")
-                print(f"Error closing PDF writer: {e}")
-        # else:
-        #     logger.warning("Merger was never initialized")
-        #     print("Warning: Merger was never initialized")
\ No newline at end of file
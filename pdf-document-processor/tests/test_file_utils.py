@@ -0,0 +1,69 @@
+"""Tests for filename ID matching in src.file_utils."""
+
+import pytest
+
+from src.file_utils import DEFAULT_ID_PATTERN, compile_id_matcher, extract_id_from_filename
+
+FILENAMES = [
+    "A1 report.pdf",
+    "a12 report.pdf",
+    "A1",
+    "A1.pdf",
+    "A1 ",
+    "A1  two spaces.pdf",
+    "  A1 leading.pdf",
+    "\tA1 leading tab.pdf",
+    "A1\t report.pdf",
+    "A1\treport.pdf",
+    "A1　report.pdf",
+    "A1　 report.pdf",
+    "　A1 report.pdf",
+    "A1\x1c report.pdf",
+    "A1\n",
+    "A1\nreport.pdf",
+    "A1 \n",
+    "\nA1 report.pdf",
+    "A1x report.pdf",
+    "AB1 report.pdf",
+    "1A report.pdf",
+    "A report.pdf",
+    " report.pdf",
+    "",
+    " ",
+    "B99 x",
+    "Z0 　",
+]
+
+
+@pytest.mark.parametrize("filename", FILENAMES)
+def test_default_matcher_agrees_with_extract(filename):
+    match_id = compile_id_matcher(DEFAULT_ID_PATTERN)
+    assert match_id(filename) == extract_id_from_filename(filename)
+
+
+@pytest.mark.parametrize("pattern", [
+    r"(?i)^a\d+$",
+    r"^[A-Z]\d+\Z",
+    r"^A\d+$|^B\d+$",
+    r"A\d+|report",
+    r"^([A-Z]\d+$)",
+    r"^A.*x",
+])
+@pytest.mark.parametrize("filename", FILENAMES + ["Ax report.pdf", "report A1.pdf"])
+def test_custom_matcher_agrees_with_extract(pattern, filename):
+    match_id = compile_id_matcher(pattern)
+    assert match_id(filename) == extract_id_from_filename(filename, pattern)
+
+
+def test_default_matcher_ids():
+    match_id = compile_id_matcher()
+    assert match_id("  a12　 report.pdf") == "a12"
+    assert match_id("A1\treport.pdf") is None
+    assert match_id("A1x report.pdf") is None
+
+
+def test_custom_matcher_ids():
+    assert compile_id_matcher(r"^[A-Z]\d+\Z")("A1\n") == "A1"
+    assert compile_id_matcher(r"^A\d+$|^B\d+$")("b7 report.pdf") == "b7"
+    assert compile_id_matcher(r"^A.*x")("Ax1 report.pdf") == "Ax1"
+    assert compile_id_matcher(r"^A.*x")("A1 x.pdf") is None
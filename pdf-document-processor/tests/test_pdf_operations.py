@@ -0,0 +1,44 @@
+"""Tests for page range handling in src.pdf_operations."""
+
+import pytest
+
+from src.pdf_operations import _page_range
+
+
+@pytest.mark.parametrize("pages, total_pages, expected", [
+    (None, 5, (0, 4)),
+    ((0, 4), 5, (0, 4)),
+    ((1, -1), 5, (1, 4)),
+    # The supplementary range: every page but the last, end inclusive
+    ((0, -2), 5, (0, 3)),
+    ((0, -2), 2, (0, 0)),
+    ((2, 2), 5, (2, 2)),
+])
+def test_page_range_is_inclusive(pages, total_pages, expected):
+    out = []
+    assert _page_range(pages, total_pages, "doc", out) == expected
+    assert out == []
+
+
+def test_page_range_clamps_end_past_last_page():
+    out = []
+    assert _page_range((1, 10), 5, "doc", out) == (1, 4)
+    assert len(out) == 1 and "fewer pages" in out[0]
+
+
+@pytest.mark.parametrize("pages, total_pages", [
+    ((3, 1), 5),
+    ((0, -2), 1),
+    ((5, 10), 5),
+])
+def test_page_range_empty(pages, total_pages):
+    out = []
+    assert _page_range(pages, total_pages, "doc", out) is None
+    assert out and "Skipping" in out[-1]
+
+
+@pytest.mark.parametrize("pages", [None, (0, -2)])
+def test_page_range_no_pages(pages):
+    out = []
+    assert _page_range(pages, 0, "doc", out) is None
+    assert out and "no pages" in out[0]